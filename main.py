@@ -1,11 +1,13 @@
-import os, csv, ssl, time, argparse, mimetypes, logging, glob, re
+import os, csv, ssl, time, argparse, mimetypes, logging, glob, re, queue, threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from string import Template
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, Template, meta, select_autoescape
 import smtplib
 from email.message import EmailMessage
 from logging.handlers import RotatingFileHandler
-from typing import cast, Optional, List, Dict, Tuple
+from typing import cast, Iterator, Optional, List, Dict, Tuple
 
 try:
     from dotenv import load_dotenv
@@ -23,8 +25,39 @@ TEMPLATE_ROOT  = os.environ.get("TEMPLATE_ROOT", "templates")
 CONTACTS_CSV   = os.environ.get("CONTACTS_CSV", "contacts.csv")
 
 SLEEP_BETWEEN  = float(os.environ.get("SLEEP_SECONDS", "8"))
+DEFAULT_RATE   = (1.0 / SLEEP_BETWEEN) if SLEEP_BETWEEN > 0 else 0.0
+DEFAULT_BURST  = float(os.environ.get("BURST", "1"))
 DEFAULT_TZ     = os.environ.get("TZ_NAME", "Africa/Tunis")
 
+CONCURRENCY     = int(os.environ.get("CONCURRENCY", "1"))
+MAX_CONCURRENCY = 15  # Gmail rejects logins past ~15 simultaneous connections
+MAX_PER_CONN    = int(os.environ.get("MAX_PER_CONN", "500"))
+
+TRANSIENT_SMTP_CODES = {421, 450, 454}
+
+# built once: loading the system CA bundle is expensive, and one context
+# is safe to share across the worker pool
+_SSL_CTX = ssl.create_default_context()
+
+_ADDR_SPLIT  = re.compile(r"[;,]")
+_SANITIZE_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+_EMAIL_RE    = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+def _valid_email(addr: str) -> bool:
+    return bool(addr) and _EMAIL_RE.fullmatch(addr) is not None
+
+def _valid_addrs(value: str) -> List[str]:
+    out: List[str] = []
+    for a in _ADDR_SPLIT.split(value):
+        a = a.strip()
+        if not a:
+            continue
+        if _valid_email(a):
+            out.append(a)
+        else:
+            LOGGER.warning(f"[ADDR] invalid address skipped: {a}")
+    return out
+
 LOG_DIR        = os.environ.get("LOG_DIR", "logs")
 LOG_FILE       = os.path.join(LOG_DIR, "mailer.log")
 SENT_CSV       = os.path.join(LOG_DIR, "sent.csv")
@@ -52,44 +85,86 @@ def setup_logging() -> logging.Logger:
 
 LOGGER = setup_logging()
 
+JINJA_CACHE_DIR = os.environ.get("JINJA_CACHE_DIR", ".jinja_cache")
+os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+ENV = Environment(
+    loader=FileSystemLoader(TEMPLATE_ROOT),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache(JINJA_CACHE_DIR),
+)
+
 def read_text(path: str) -> str:
     with open(path, "r", encoding="utf-8") as f:
         return f.read()
 
-def render(text: str, mapping: Dict[str, str]) -> str:
-    return Template(text).safe_substitute(mapping)
+@lru_cache(maxsize=256)
+def _read_text_cached(path: str, mtime: float) -> str:
+    return read_text(path)
 
-def load_templates(lang: str, row: Dict[str, str]) -> Tuple[str, str, Optional[str], str]:
+_ISFILE_CACHE: Dict[str, bool] = {}
+
+def _isfile_cached(path: str) -> bool:
+    hit = _ISFILE_CACHE.get(path)
+    if hit is None:
+        hit = _ISFILE_CACHE[path] = os.path.isfile(path)
+    return hit
+
+def _read_template(path: str) -> str:
+    return _read_text_cached(path, os.path.getmtime(path))
+
+@lru_cache(maxsize=256)
+def _compile_external(path: str, mtime: float) -> Template:
+    # from_string would otherwise autoescape everything: decide from the
+    # extension like the loader does, so text templates stay unescaped
+    autoescape = path.lower().endswith((".html", ".htm"))
+    return ENV.overlay(autoescape=autoescape).from_string(_read_text_cached(path, mtime))
+
+def _get_template(path: str) -> Template:
+    name = os.path.relpath(path, TEMPLATE_ROOT).replace(os.sep, "/")
+    if name.startswith(".."):
+        # row-level override pointing outside TEMPLATE_ROOT
+        return _compile_external(path, os.path.getmtime(path))
+    return ENV.get_template(name)
+
+def load_templates(lang: str, row: Dict[str, str]) -> Tuple[Template, Template, Optional[Template], str]:
     lang = (lang or "en").strip().lower()
     lang_dir = os.path.join(TEMPLATE_ROOT, lang)
     subj_path = (row.get("subject_file") or os.path.join(lang_dir, "subject.txt")).strip()
     body_txt  = (row.get("body_file")    or os.path.join(lang_dir, "body.txt")).strip()
     body_html = (row.get("body_html_file") or os.path.join(lang_dir, "body.html")).strip()
-    if not os.path.isfile(subj_path):
+    if not _isfile_cached(subj_path):
         raise FileNotFoundError(f"Missing subject template: {subj_path}")
-    if not os.path.isfile(body_txt):
+    if not _isfile_cached(body_txt):
         raise FileNotFoundError(f"Missing body template: {body_txt}")
-    subject_text = read_text(subj_path)
-    body_text    = read_text(body_txt)
-    html_text: Optional[str] = None
-    if os.path.isfile(body_html):
-        candidate = read_text(body_html).strip()
-        if candidate:
-            html_text = candidate
-    return subject_text, body_text, html_text, lang
+    subject_tpl = _get_template(subj_path)
+    body_tpl    = _get_template(body_txt)
+    html_tpl: Optional[Template] = None
+    if _isfile_cached(body_html) and _read_template(body_html).strip():
+        html_tpl = _get_template(body_html)
+    return subject_tpl, body_tpl, html_tpl, lang
 
-def attach_file(msg: EmailMessage, path: str) -> None:
-    ctype, encoding = mimetypes.guess_type(path)
+@lru_cache(maxsize=None)
+def _guess_by_ext(ext: str) -> Tuple[Optional[str], Optional[str]]:
+    return mimetypes.guess_type("x" + ext)
+
+@lru_cache(maxsize=64)
+def _load_attachment(path: str) -> Tuple[bytes, str, str, str]:
+    ctype, encoding = _guess_by_ext(os.path.splitext(path)[1].lower())
     if ctype is None or encoding is not None:
         ctype = "application/octet-stream"
     maintype, subtype = ctype.split("/", 1)
     with open(path, "rb") as f:
-        msg.add_attachment(f.read(), maintype=maintype, subtype=subtype, filename=os.path.basename(path))
+        data = f.read()
+    return data, maintype, subtype, os.path.basename(path)
 
-def expand_attachments(value: str) -> List[str]:
-    if not value:
-        return []
-    parts = [p.strip() for p in value.replace(";", ",").split(",") if p.strip()]
+def attach_file(msg: EmailMessage, path: str) -> None:
+    data, maintype, subtype, filename = _load_attachment(path)
+    msg.add_attachment(data, maintype=maintype, subtype=subtype, filename=filename)
+
+@lru_cache(maxsize=256)
+def _expand_attachments_cached(value: str) -> Tuple[str, ...]:
+    parts = [p.strip() for p in _ADDR_SPLIT.split(value) if p.strip()]
     files: List[str] = []
     for pat in parts:
         matches = sorted(glob.glob(pat))
@@ -103,23 +178,67 @@ def expand_attachments(value: str) -> List[str]:
         if f not in seen:
             uniq.append(f)
             seen.add(f)
-    return uniq
+    return tuple(uniq)
+
+def expand_attachments(value: str) -> List[str]:
+    if not value:
+        return []
+    return list(_expand_attachments_cached(value))
+
+SENT_INDEX: Optional[Dict[str, Dict[str, str]]] = None
 
 def read_sent_index() -> Dict[str, Dict[str, str]]:
-    idx: Dict[str, Dict[str, str]] = {}
-    if os.path.isfile(SENT_CSV):
-        with open(SENT_CSV, newline="", encoding="utf-8") as f:
-            for row in csv.DictReader(f):
-                idx[(row.get("email") or "").strip()] = row
-    return idx
-
-def append_sent_record(row: Dict[str, str], subject: str, status: str, error: str = "") -> None:
-    exists = os.path.isfile(SENT_CSV)
-    with open(SENT_CSV, "a", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=["time","email","name","lang","subject","status","error"])
+    global SENT_INDEX
+    if SENT_INDEX is None:
+        idx: Dict[str, Dict[str, str]] = {}
+        if os.path.isfile(SENT_CSV):
+            with open(SENT_CSV, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    idx[(row.get("email") or "").strip()] = row
+        SENT_INDEX = idx
+    return SENT_INDEX
+
+class RateLimiter:
+    """Token bucket shared by all workers. A rate of 0 disables limiting."""
+
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = max(burst, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                self._cond.wait((1.0 - self._tokens) / self.rate)
+
+class SentLog:
+    """Writer for sent.csv that keeps the file open for the whole batch."""
+
+    FIELDS = ["time","email","name","lang","subject","status","error"]
+    FLUSH_EVERY = 50
+
+    def __enter__(self) -> "SentLog":
+        exists = os.path.isfile(SENT_CSV)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._f = open(SENT_CSV, "a", newline="", encoding="utf-8")
+        self._w = csv.DictWriter(self._f, fieldnames=self.FIELDS)
         if not exists:
-            w.writeheader()
-        w.writerow({
+            self._w.writeheader()
+        return self
+
+    def write(self, row: Dict[str, str], subject: str, status: str, error: str = "") -> None:
+        rec = {
             "time": datetime.now().isoformat(timespec="seconds"),
             "email": (row.get("email") or "").strip(),
             "name": (row.get("name") or "").strip(),
@@ -127,48 +246,51 @@ def append_sent_record(row: Dict[str, str], subject: str, status: str, error: st
             "subject": subject,
             "status": status,
             "error": error
-        })
+        }
+        with self._lock:
+            self._w.writerow(rec)
+            self._pending += 1
+            if self._pending >= self.FLUSH_EVERY:
+                self._f.flush()
+                self._pending = 0
+            read_sent_index()[rec["email"]] = rec
+
+    def __exit__(self, *exc: object) -> None:
+        self._f.close()
 
 def generate_dashboard(contacts_rows: List[Dict[str, str]], sent_idx: Dict[str, Dict[str, str]]) -> None:
     os.makedirs(LOG_DIR, exist_ok=True)
-    total = len(contacts_rows)
-    sent_count = sum(1 for r in contacts_rows if sent_idx.get((r.get("email") or "").strip(), {}).get("status") == "success")
-    def row_html(r: Dict[str, str]) -> str:
+    sent_emails = {e for e, r in sent_idx.items() if r.get("status") == "success"}
+    get_rec = sent_idx.get
+    rows: List[Dict[str, object]] = []
+    append = rows.append
+    sent_count = 0
+    for r in contacts_rows:
         email = (r.get("email") or "").strip()
-        srec  = sent_idx.get(email)
-        checked = "checked" if srec and srec.get("status") == "success" else ""
-        last = srec.get("time") if srec else ""
-        subj = srec.get("subject","") if srec else ""
-        name = (r.get("name") or "")
-        lang = (r.get("lang") or "")
-        return f"<tr><td>{name}</td><td>{email}</td><td>{lang}</td><td><input type='checkbox' {checked} disabled></td><td>{last}</td><td>{subj}</td></tr>"
-    rows_html = "\n".join(row_html(r) for r in contacts_rows)
-    html = f"""<!doctype html><html lang="en"><head>
-<meta charset="utf-8"><title>Mailer Dashboard</title>
-<style>
-body{{font-family:Arial,sans-serif;margin:24px}} h1{{margin-bottom:0}}
-.summary{{color:#444;margin:4px 0 16px}} table{{border-collapse:collapse;width:100%}}
-th,td{{border:1px solid #ddd;padding:8px;font-size:14px}} th{{background:#f3f4f6;text-align:left}}
-tr:nth-child(even){{background:#fafafa}} .badge{{display:inline-block;padding:2px 6px;background:#eef;border-radius:4px}}
-</style></head><body>
-<h1>Mailer Dashboard</h1>
-<div class="summary">Total: <span class="badge">{total}</span> &nbsp; Sent: <span class="badge">{sent_count}</span> &nbsp; Unsent: <span class="badge">{total-sent_count}</span></div>
-<table><thead><tr><th>Name</th><th>Email</th><th>Lang</th><th>Sent</th><th>Last sent</th><th>Subject</th></tr></thead><tbody>
-{rows_html}
-</tbody></table></body></html>"""
-    with open(DASHBOARD_HTML, "w", encoding="utf-8") as f:
-        f.write(html)
+        is_sent = email in sent_emails
+        sent_count += is_sent
+        srec = get_rec(email)
+        append({
+            "name": r.get("name") or "",
+            "email": email,
+            "lang": r.get("lang") or "",
+            "sent": is_sent,
+            "last": srec.get("time") if srec else "",
+            "subj": srec.get("subject", "") if srec else "",
+        })
+    tmpl = ENV.get_template("_dashboard.html")
+    tmpl.stream(total=len(rows), sent_count=sent_count, rows=rows).dump(DASHBOARD_HTML, encoding="utf-8")
     LOGGER.info(f"Dashboard written to {DASHBOARD_HTML}")
 
-def build_message(row: Dict[str, str]) -> Tuple[EmailMessage, str, List[str]]:
+def build_message(row: Dict[str, str]) -> Tuple[EmailMessage, str, List[str], str, Optional[str]]:
     lang = (row.get("lang") or "en").strip().lower()
     to_addr = (row.get("email") or "").strip()
-    if not to_addr or "@" not in to_addr:
+    if not _valid_email(to_addr):
         raise ValueError(f"Invalid recipient: {to_addr}")
-    subject_tpl, body_txt, body_html, lang = load_templates(lang, row)
+    subject_tpl, body_tpl, html_tpl, lang = load_templates(lang, row)
     mapping = {**DEFAULTS, **{k: (v or "") for k, v in row.items()}}
-    subject = render(subject_tpl, mapping).strip().replace("\n", " ")
-    body_text = render(body_txt, mapping)
+    subject = subject_tpl.render(mapping).strip().replace("\n", " ")
+    body_text = body_tpl.render(mapping)
     msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"]    = f'{SENDER_NAME} <{SENDER_EMAIL}>'
@@ -180,8 +302,10 @@ def build_message(row: Dict[str, str]) -> Tuple[EmailMessage, str, List[str]]:
     if DEFAULTS.get("reply_to"):
         msg["Reply-To"] = DEFAULTS["reply_to"]
     msg.set_content(body_text)
-    if body_html:
-        msg.add_alternative(render(body_html, mapping), subtype="html")
+    html_text: Optional[str] = None
+    if html_tpl:
+        html_text = html_tpl.render(mapping)
+        msg.add_alternative(html_text, subtype="html")
     files = expand_attachments(row.get("attachments", ""))
     if not files and ATTACH_LANG_DIR_FALLBACK:
         lang_dir = os.path.join("attachments", lang)
@@ -194,37 +318,82 @@ def build_message(row: Dict[str, str]) -> Tuple[EmailMessage, str, List[str]]:
             LOGGER.warning(f"[ATTACH-ERR] {path}: {e}")
     recipients: List[str] = [to_addr]
     if row.get("cc"):
-        recipients += [a.strip() for a in row["cc"].replace(";", ",").split(",") if a.strip()]
+        recipients += _valid_addrs(row["cc"])
     if row.get("bcc"):
-        recipients += [a.strip() for a in row["bcc"].replace(";", ",").split(",") if a.strip()]
+        recipients += _valid_addrs(row["bcc"])
         try:
             del msg["Bcc"]
         except Exception:
             pass
-    return msg, subject, recipients
+    return msg, subject, recipients, body_text, html_text
+
+_TO_PLACEHOLDER = "%TO%"
+_BROADCAST_ROW_KEYS = ("cc", "bcc", "attachments", "subject_file", "body_file", "body_html_file")
+
+@lru_cache(maxsize=16)
+def _template_vars(lang: str) -> "frozenset[str]":
+    lang_dir = os.path.join(TEMPLATE_ROOT, lang)
+    names: set = set()
+    for fname in ("subject.txt", "body.txt", "body.html"):
+        path = os.path.join(lang_dir, fname)
+        if _isfile_cached(path):
+            names |= meta.find_undeclared_variables(ENV.parse(_read_template(path)))
+    return frozenset(names)
 
-def read_contacts() -> List[Dict[str, str]]:
+def _is_broadcastable(row: Dict[str, str], lang: str) -> bool:
+    if any(row.get(k) for k in _BROADCAST_ROW_KEYS):
+        return False
+    used = _template_vars(lang)
+    if not used <= frozenset(DEFAULTS):
+        return False
+    # a row value would override the default the shared body was rendered with
+    return not any(row.get(k) for k in used)
+
+def read_contacts() -> Iterator[Dict[str, str]]:
     with open(CONTACTS_CSV, newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader, [])]
+        width = len(header)
+        for vals in reader:
+            if not vals:
+                continue
+            if len(vals) != width:
+                vals = (vals + [""] * width)[:width]
+            yield dict(zip(header, vals))
+
+def read_contacts_list() -> List[Dict[str, str]]:
+    return list(read_contacts())
+
+def _dashboard_row(row: Dict[str, str]) -> Dict[str, str]:
+    return {
+        "email": (row.get("email") or "").strip(),
+        "name": (row.get("name") or ""),
+        "lang": (row.get("lang") or ""),
+    }
 
 def _sanitize(name: str) -> str:
-    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)[:120]
-
-def _extract_bodies(msg: EmailMessage) -> Tuple[str, Optional[str]]:
-    plain = ""
-    html: Optional[str] = None
-    if msg.is_multipart():
-        for part in msg.walk():
-            ctype = part.get_content_type()
-            if ctype == "text/plain":
-                plain = part.get_content()
-            elif ctype == "text/html":
-                html = part.get_content()
-    else:
-        plain = msg.get_content()
-    return plain, html
-
-def send_batch(dry_run: bool = False, resend: bool = False, limit: Optional[int] = None, preview_dir: Optional[str] = None) -> None:
+    return _SANITIZE_RE.sub("_", name)[:120]
+
+def _dry_one(row: Dict[str, str], out_dir: str, i: int) -> str:
+    email = (row.get("email") or "").strip()
+    m, subject, _recips, plain, html = build_message(row)
+    localpart = email.split("@", 1)[0]
+    dest_dir = os.path.join(out_dir, _sanitize(localpart))
+    os.makedirs(dest_dir, exist_ok=True)
+    prefix = f"{i+1:03d}"
+    subj_path = os.path.join(dest_dir, f"{prefix}.subject.txt")
+    body_path = os.path.join(dest_dir, f"{prefix}.body.txt")
+    with open(subj_path, "w", encoding="utf-8") as f:
+        f.write(subject + "\n")
+    with open(body_path, "w", encoding="utf-8") as f:
+        f.write(plain)
+    if html:
+        html_path = os.path.join(dest_dir, f"{prefix}.body.html")
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(html)
+    return f"[DRY] {m['To']} | {subject} -> {body_path}"
+
+def send_batch(dry_run: bool = False, resend: bool = False, limit: Optional[int] = None, preview_dir: Optional[str] = None, concurrency: int = CONCURRENCY, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST) -> None:
     missing = [k for k in ("SENDER_EMAIL","APP_PASSWORD") if not os.environ.get(k)]
     if missing and not dry_run:
         raise RuntimeError(f"Missing env vars: {', '.join(missing)}")
@@ -234,68 +403,201 @@ def send_batch(dry_run: bool = False, resend: bool = False, limit: Optional[int]
     if dry_run:
         out_dir = preview_dir or os.path.join(LOG_DIR, "dry-run")
         os.makedirs(out_dir, exist_ok=True)
+        dash_rows: List[Dict[str, str]] = []
+        jobs: List[Tuple[Dict[str, str], int]] = []
         i = 0
         for r in rows:
+            dash_rows.append(_dashboard_row(r))
             email = (r.get("email") or "").strip()
-            if not email or "@" not in email:
+            if not _valid_email(email):
                 print(f"[DRY-ERR] {email}: invalid recipient")
                 continue
             if not resend and email in already_sent:
                 print(f"[DRY-SKIP] {email} already sent")
                 continue
-            try:
-                m, subject, _recips = build_message(r)
-                plain, html = _extract_bodies(m)
-                localpart = email.split("@", 1)[0]
-                dest_dir = os.path.join(out_dir, _sanitize(localpart))
-                os.makedirs(dest_dir, exist_ok=True)
-                prefix = f"{i+1:03d}"
-                subj_path = os.path.join(dest_dir, f"{prefix}.subject.txt")
-                body_path = os.path.join(dest_dir, f"{prefix}.body.txt")
-                with open(subj_path, "w", encoding="utf-8") as f:
-                    f.write(subject + "\n")
-                with open(body_path, "w", encoding="utf-8") as f:
-                    f.write(plain)
-                if html:
-                    html_path = os.path.join(dest_dir, f"{prefix}.body.html")
-                    with open(html_path, "w", encoding="utf-8") as f:
-                        f.write(html)
-                print(f"[DRY] {m['To']} | {subject} -> {body_path}")
-                i += 1
-            except Exception as e:
-                print(f"[DRY-ERR] {email}: {e}")
-        generate_dashboard(rows, read_sent_index())
+            jobs.append((r, i))
+            i += 1
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            futures = {pool.submit(_dry_one, r, out_dir, idx): r for r, idx in jobs}
+            for fut in as_completed(futures):
+                email = (futures[fut].get("email") or "").strip()
+                try:
+                    print(fut.result())
+                except Exception as e:
+                    print(f"[DRY-ERR] {email}: {e}")
+        generate_dashboard(dash_rows, read_sent_index())
         return
-    context = ssl.create_default_context()
     sender = cast(str, SENDER_EMAIL)
     password = cast(str, APP_PASSWORD)
-    with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, context=context) as server:
-        server.login(sender, password)
-        sent = 0
-        for row in rows:
-            to_addr = (row.get("email") or "").strip()
-            if not to_addr or "@" not in to_addr:
-                LOGGER.warning(f"[SKIP] invalid email: {to_addr}")
-                continue
-            if not resend and to_addr in already_sent:
-                LOGGER.info(f"[SKIP] already sent to {to_addr}")
-                continue
-            subject = ""
+    workers = max(1, min(concurrency, MAX_CONCURRENCY))
+    if workers != concurrency:
+        LOGGER.warning(f"[POOL] concurrency clamped to {workers}")
+    pending: List[Dict[str, str]] = []
+    dash_rows = []
+    for row in rows:
+        dash_rows.append(_dashboard_row(row))
+        to_addr = (row.get("email") or "").strip()
+        if not _valid_email(to_addr):
+            LOGGER.warning(f"[SKIP] invalid email: {to_addr}")
+            continue
+        if not resend and to_addr in already_sent:
+            LOGGER.info(f"[SKIP] already sent to {to_addr}")
+            continue
+        pending.append(row)
+    q: "queue.Queue[Optional[Dict[str, str]]]" = queue.Queue()
+    for row in pending:
+        q.put(row)
+    for _ in range(workers):
+        q.put(None)
+    state_lock = threading.Lock()
+    counters = {"sent": 0}
+    limiter = RateLimiter(rate, burst)
+    limit_hit = threading.Event()
+    broadcast_lock = threading.Lock()
+    broadcast_cache: Dict[str, Tuple[bytes, str]] = {}
+
+    def broadcast_payload(row: Dict[str, str], lang: str) -> Tuple[bytes, str]:
+        with broadcast_lock:
+            hit = broadcast_cache.get(lang)
+            if hit is None:
+                msg, subject, _recips, _plain, _html = build_message(row)
+                msg.replace_header("To", _TO_PLACEHOLDER)
+                hit = broadcast_cache[lang] = (msg.as_bytes(), subject)
+        return hit
+
+    def open_conn() -> smtplib.SMTP_SSL:
+        s = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, context=_SSL_CTX)
+        s.login(sender, password)
+        return s
+
+    def deliver(conn: List[smtplib.SMTP_SSL], send) -> None:
+        # conn is a one-slot box: replacement connections are stored back into
+        # it immediately, so the caller keeps the live session even when a
+        # later attempt raises
+        delay = max(SLEEP_BETWEEN, 1.0)
+        for attempt in range(3):
             try:
-                msg, subject, recipients = build_message(row)
-                server.send_message(msg, from_addr=SENDER_EMAIL, to_addrs=recipients)
-                sent += 1
-                LOGGER.info(f"[OK] {to_addr} | {subject}")
-                append_sent_record(row, subject, "success")
-                time.sleep(SLEEP_BETWEEN)
-                if limit is not None and sent >= limit:
-                    LOGGER.info(f"[STOP] limit {limit} reached")
+                send(conn[0])
+                return
+            except smtplib.SMTPServerDisconnected:
+                if attempt:
+                    raise
+                LOGGER.warning("[CONN] server disconnected, reconnecting")
+                try:
+                    conn[0].close()
+                except Exception:
+                    pass
+                conn[0] = open_conn()
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code not in TRANSIENT_SMTP_CODES or attempt == 2:
+                    raise
+                LOGGER.warning(f"[CONN] transient {e.smtp_code}, retrying in {delay:.0f}s")
+                time.sleep(delay)
+                delay *= 2
+
+    def worker() -> None:
+        conn = [open_conn()]
+        msgs_on_conn = 0
+        try:
+            while True:
+                row = q.get()
+                if row is None:
                     break
+                if limit_hit.is_set():
+                    continue
+                to_addr = (row.get("email") or "").strip()
+                subject = ""
+                slot_held = False
+                try:
+                    lang = (row.get("lang") or "en").strip().lower()
+                    if _is_broadcastable(row, lang):
+                        data, subject = broadcast_payload(row, lang)
+                        payload = data.replace(_TO_PLACEHOLDER.encode("ascii"), to_addr.encode("ascii"))
+                        send = lambda s: s.sendmail(sender, [to_addr], payload)
+                    else:
+                        msg, subject, recipients, _plain, _html = build_message(row)
+                        send = lambda s: s.send_message(msg, from_addr=SENDER_EMAIL, to_addrs=recipients)
+                    if limit is not None:
+                        # reserve a slot before sending so workers cannot overshoot
+                        with state_lock:
+                            if counters["sent"] >= limit:
+                                if not limit_hit.is_set():
+                                    limit_hit.set()
+                                    LOGGER.info(f"[STOP] limit {limit} reached")
+                                continue
+                            counters["sent"] += 1
+                            slot_held = True
+                    if msgs_on_conn >= MAX_PER_CONN:
+                        LOGGER.info(f"[CONN] recycling connection after {msgs_on_conn} messages")
+                        try:
+                            conn[0].quit()
+                        except Exception:
+                            pass
+                        conn[0] = open_conn()
+                        msgs_on_conn = 0
+                    limiter.acquire()
+                    prev = conn[0]
+                    try:
+                        deliver(conn, send)
+                    finally:
+                        if conn[0] is not prev:
+                            msgs_on_conn = 0
+                    msgs_on_conn += 1
+                    slot_held = False
+                    if limit is None:
+                        with state_lock:
+                            counters["sent"] += 1
+                    LOGGER.info(f"[OK] {to_addr} | {subject}")
+                    sent_log.write(row, subject, "success")
+                except Exception as e:
+                    if slot_held:
+                        # failed send gives its slot back
+                        with state_lock:
+                            counters["sent"] -= 1
+                    LOGGER.error(f"[ERR] {to_addr}: {e}")
+                    sent_log.write(row, subject, "failed", str(e))
+        finally:
+            try:
+                conn[0].quit()
+            except Exception:
+                pass
+
+    errors: List[BaseException] = []
+    with SentLog() as sent_log, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smtp") as pool:
+        futures = [pool.submit(worker) for _ in range(workers)]
+        for fut in futures:
+            try:
+                fut.result()
             except Exception as e:
-                LOGGER.error(f"[ERR] {to_addr}: {e}")
-                append_sent_record(row, subject, "failed", str(e))
-        LOGGER.info(f"[DONE] {sent} messages sent.")
-    generate_dashboard(rows, read_sent_index())
+                LOGGER.error(f"[POOL] worker died: {e}")
+                errors.append(e)
+    if errors:
+        raise errors[0]
+    LOGGER.info(f"[DONE] {counters['sent']} messages sent.")
+    generate_dashboard(dash_rows, read_sent_index())
+
+def _warm_start() -> None:
+    """Preload per-process caches so a scheduled trigger starts sending immediately.
+
+    The expensive state (SSL context, compiled templates, sent index,
+    attachment bytes) is module-level and survives between APScheduler
+    triggers; this just pays the cold-start cost up front instead of on
+    the first run.
+    """
+    read_sent_index()
+    try:
+        langs = sorted(os.listdir(TEMPLATE_ROOT))
+    except OSError as e:
+        LOGGER.warning(f"[WARM] template preload failed: {e}")
+        return
+    for lang in langs:
+        if lang.startswith("_") or not os.path.isdir(os.path.join(TEMPLATE_ROOT, lang)):
+            continue
+        try:
+            load_templates(lang, {})
+            _template_vars(lang)
+        except FileNotFoundError:
+            continue
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generic multilingual scheduled mail-merge")
@@ -310,24 +612,28 @@ def main() -> None:
     parser.add_argument("--resend", action="store_true", help="ignore sent registry and send again")
     parser.add_argument("--limit", type=int, default=None, help="max emails to send this run")
     parser.add_argument("--out-dir", type=str, default=None, help="directory to write dry-run previews")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help=f"parallel SMTP connections, max {MAX_CONCURRENCY}")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="messages per second across all workers, 0 for unlimited")
+    parser.add_argument("--burst", type=float, default=DEFAULT_BURST, help="token-bucket burst size")
     args = parser.parse_args()
     if args.report:
-        rows = read_contacts()
+        rows = read_contacts_list()
         generate_dashboard(rows, read_sent_index())
         return
     if args.send_now:
-        send_batch(dry_run=args.dry_run, resend=args.resend, limit=args.limit, preview_dir=args.out_dir)
+        send_batch(dry_run=args.dry_run, resend=args.resend, limit=args.limit, preview_dir=args.out_dir, concurrency=args.concurrency, rate=args.rate, burst=args.burst)
         return
     from apscheduler.schedulers.blocking import BlockingScheduler
     from apscheduler.triggers.date import DateTrigger
     from apscheduler.triggers.cron import CronTrigger
+    _warm_start()
     sched = BlockingScheduler(timezone=ZoneInfo(args.tz), job_defaults={"misfire_grace_time": 300, "coalesce": True})
     if args.send_at:
         dt = datetime.strptime(args.send_at, "%Y-%m-%d %H:%M")
         sched.add_job(
             send_batch,
             DateTrigger(run_date=dt.replace(tzinfo=ZoneInfo(args.tz))),
-            kwargs={"dry_run": args.dry_run, "resend": args.resend, "limit": args.limit, "preview_dir": args.out_dir},
+            kwargs={"dry_run": args.dry_run, "resend": args.resend, "limit": args.limit, "preview_dir": args.out_dir, "concurrency": args.concurrency, "rate": args.rate, "burst": args.burst},
         )
         LOGGER.info(f"[SCHED] one-shot at {dt} {args.tz}")
     elif args.daily:
@@ -335,7 +641,7 @@ def main() -> None:
         sched.add_job(
             send_batch,
             CronTrigger(hour=int(hh), minute=int(mm)),
-            kwargs={"dry_run": args.dry_run, "resend": args.resend, "limit": args.limit, "preview_dir": args.out_dir},
+            kwargs={"dry_run": args.dry_run, "resend": args.resend, "limit": args.limit, "preview_dir": args.out_dir, "concurrency": args.concurrency, "rate": args.rate, "burst": args.burst},
         )
         LOGGER.info(f"[SCHED] daily at {hh}:{mm} {args.tz}")
     elif args.cron:
@@ -343,7 +649,7 @@ def main() -> None:
         sched.add_job(
             send_batch,
             CronTrigger(minute=m, hour=h, day=dom, month=mon, day_of_week=dow),
-            kwargs={"dry_run": args.dry_run, "resend": args.resend, "limit": args.limit, "preview_dir": args.out_dir},
+            kwargs={"dry_run": args.dry_run, "resend": args.resend, "limit": args.limit, "preview_dir": args.out_dir, "concurrency": args.concurrency, "rate": args.rate, "burst": args.burst},
         )
         LOGGER.info(f"[SCHED] cron {args.cron} {args.tz}")
     try: